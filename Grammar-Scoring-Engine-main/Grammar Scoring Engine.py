@@ -2,14 +2,29 @@
 
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog
-import whisper                     # For transcribing audio using OpenAI’s Whisper model
-import language_tool_python        # For grammar and style checking
+from faster_whisper import WhisperModel, BatchedInferencePipeline  # For transcribing audio using Whisper (CTranslate2 backend)
+import ctranslate2                 # For detecting a CUDA device for Whisper
+import language_tool_python        # For starting the LanguageTool grammar and style servers
+from language_tool_python.match import four_byte_char_positions
+import requests                    # For calling the LanguageTool HTTP API over keep-alive connections
+from requests.adapters import HTTPAdapter
 import sounddevice as sd           # For audio recording
 import soundfile as sf             # For audio file handling
+from scipy.signal import resample_poly  # For resampling audio files to Whisper's 16 kHz
 import numpy as np                 # For numerical operations on audio data
-import os                          # For file operations
+import os                          # For sizing the LanguageTool server pool
+import itertools                   # For round-robin over LanguageTool servers
+import bisect                      # For mapping LanguageTool offsets to string indices
+import urllib.parse                # For building the LanguageTool check endpoints
 import time                        # For timing and recording duration
+import threading                   # For transcribing while recording is in progress
+import functools                   # For caching analysis results
+import hashlib                     # For keying the grammar check cache
+import concurrent.futures          # For running transcription and analysis off the GUI thread
+import asyncio                     # For running independent analysis stages concurrently
 import textstat                    # For advanced readability and style metrics
+import collections                 # For lightweight grammar match records
+from metrics import classify_error, compute_metrics, contextual_language_feedback, generate_report
 
 # ---------------------------
 # Global Constants & Helpers
@@ -23,77 +38,19 @@ ERROR_WEIGHTS = {
     'STYLE': 1.5
 }
 
-# List of filler words to count in the transcript.
-FILLER_WORDS = ["um", "uh", "like", "you know", "ah", "er"]
+# Configure textstat once; its per-text caches are shared by all readability indices
+textstat.set_lang("en")
 
 # Dictionary to store inline error matches using tag names in the transcript text widget.
 inline_errors = {}
+# Transcript text and matches from the last inline check, so that after an edit only
+# the changed paragraphs are sent to LanguageTool again.
+last_inline_text = ""
+last_inline_matches = ()
+# Id of the latest transcription and analysis; results of older ones are discarded
+analysis_job = 0
 
-def classify_error(match):
-    """
-    Classify a grammar/style error (match) into one of the categories:
-    'GRAMMAR', 'TYPOS', 'PUNCTUATION', or 'STYLE'
-    
-    Args:
-        match: A language_tool_python match object containing error details.
-    
-    Returns:
-        A string representing the error category.
-    """
-    rule_id = match.ruleId
-    message = match.message.lower()
-    # Classify as typo based on rule id or if message mentions spelling
-    if rule_id == "MORFOLOGIK_RULE_EN_US" or "spelling" in message:
-        return "TYPOS"
-    # Classify as punctuation if message contains punctuation keywords
-    elif "punctuation" in message:
-        return "PUNCTUATION"
-    # Classify as style if message indicates style or readability issues
-    elif "style" in message or "readability" in message:
-        return "STYLE"
-    # Default category is grammar
-    else:
-        return "GRAMMAR"
-
-def compute_metrics(transcript, audio_duration, error_breakdown, overall_score):
-    """
-    Compute various metrics from the transcript including:
-      - Word count
-      - Speaking rate (words per minute)
-      - Filler word count
-      - Error counts
-    
-    Args:
-        transcript: The transcribed text from the audio.
-        audio_duration: Duration of the audio recording (in seconds).
-        error_breakdown: Dictionary containing counts of errors by category.
-        overall_score: Final overall grammar score after penalties.
-    
-    Returns:
-        A dictionary of computed metrics.
-    """
-    # Split transcript into words and count them
-    words = transcript.split()
-    word_count = len(words)
-    # Calculate words per minute (WPM)
-    wpm = round(word_count / (audio_duration / 60), 2) if audio_duration > 0 else 0
-    transcript_lower = transcript.lower()
-    # Count occurrences of each filler word in the transcript
-    filler_count = sum(transcript_lower.count(filler) for filler in FILLER_WORDS)
-    
-    metrics = {
-        "score": overall_score,
-        "word_count": word_count,
-        "wpm": wpm,
-        "filler_count": filler_count,
-        "errors": {
-            "GRAMMAR": error_breakdown.get("GRAMMAR", 0),
-            "TYPOS": error_breakdown.get("TYPOS", 0),
-            "PUNCTUATION": error_breakdown.get("PUNCTUATION", 0)
-        }
-    }
-    return metrics
-
+@functools.lru_cache(maxsize=64)
 def advanced_style_analysis(text):
     """
     Analyze the style and readability of the text using various readability indices.
@@ -104,7 +61,9 @@ def advanced_style_analysis(text):
     Returns:
         A dictionary containing advanced readability metrics and style recommendations.
     """
-    # Calculate Flesch Reading Ease, Flesch-Kincaid Grade, and Gunning Fog index
+    # Calculate Flesch Reading Ease, Flesch-Kincaid Grade, and Gunning Fog index.
+    # All three receive the same string so textstat reuses its cached
+    # sentence, word and syllable counts instead of re-tokenising.
     fre = textstat.flesch_reading_ease(text)
     fk_grade = textstat.flesch_kincaid_grade(text)
     gunning = textstat.gunning_fog(text)
@@ -136,93 +95,227 @@ def advanced_style_analysis(text):
         "advanced_recommendations": recommendations
     }
 
-def contextual_language_feedback(text, error_details):
+# ---------------------------
+# Initialize Models & Tools
+# ---------------------------
+
+# Distil-Whisper keeps the full encoder but only 2 decoder layers, making decoding
+# several times faster at a small accuracy cost. The English-only small variant
+# keeps CPU-only machines responsive (LanguageTool checks en-US anyway).
+WHISPER_GPU_MODEL = "distil-large-v3"
+WHISPER_CPU_MODEL = "distil-small.en"
+
+def load_whisper_model():
     """
-    Provide personalized feedback based on the types of errors detected.
-    
-    Args:
-        text: The original transcript text.
-        error_details: A list of error detail strings from the grammar checker.
+    Load the Whisper model on the GPU in FP16 when a CUDA device is present, falling
+    back to INT8 on the CPU if there is none or the model cannot be created on it.
+    The large GPU model is only downloaded on machines that have a CUDA device.
     
     Returns:
-        A string containing aggregated contextual feedback.
+        A faster_whisper.WhisperModel instance.
     """
-    suggestions = []
-    for detail in error_details:
-        # Append suggestions based on detected error categories
-        if "Category: TYPOS" in detail:
-            suggestions.append("Review suggested corrections for typos and consider using a spell-checker.")
-        if "Category: GRAMMAR" in detail:
-            suggestions.append("Review grammar suggestions and study common grammatical patterns.")
-        if "Category: PUNCTUATION" in detail:
-            suggestions.append("Review punctuation guidelines to improve sentence clarity.")
-        if "Category: STYLE" in detail:
-            suggestions.append("Consider revising stylistically ambiguous sentences for better readability.")
-    
-    # Remove duplicate suggestions while preserving order
-    suggestions = list(dict.fromkeys(suggestions))
-    if suggestions:
-        return " ".join(suggestions)
-    else:
-        return "No additional contextual feedback available."
+    if ctranslate2.get_cuda_device_count() > 0:
+        try:
+            return WhisperModel(WHISPER_GPU_MODEL, device="cuda", compute_type="float16")
+        except Exception as e:
+            print("Whisper GPU Error, falling back to CPU:", e)
+    return WhisperModel(WHISPER_CPU_MODEL, device="cpu", compute_type="int8")
+
+# Load the Whisper model for audio transcription. faster-whisper runs it on
+# CTranslate2 with reduced-precision weights, which is several times faster than
+# the reference FP32 PyTorch implementation at the same accuracy.
+model = load_whisper_model()
+# Batched pipeline: VAD-segmented 30s chunks of one recording are decoded together
+batched_model = BatchedInferencePipeline(model=model)
+# Worker threads for transcription and analysis, keeping the Tk main loop responsive
+executor = concurrent.futures.ThreadPoolExecutor(max_workers=2)
+# Background event loop that fans independent analysis stages out to the executor
+analysis_loop = asyncio.new_event_loop()
+threading.Thread(target=analysis_loop.run_forever, daemon=True).start()
+
+# Number of LanguageTool servers; checks are spread across them round-robin. Each one
+# is a separate JVM with its own cache, so keep the pool small for a single-user GUI.
+LT_POOL_SIZE = min(2, max(1, (os.cpu_count() or 2) // 2))
+# LanguageTool server configuration. The server-side cache lets repeated checks
+# of the same sentences skip the rule pipeline.
+LT_CONFIG = {
+    'cacheSize': 10000,
+    'pipelineCaching': True,
+    'maxCheckThreads': 8
+}
+
+# Running LanguageTool servers as (LanguageTool instance, /v2/check endpoint) pairs;
+# checks are posted straight to the endpoints, round-robin
+lt_servers = []
+lt_counter = itertools.count()
+
+def start_language_tool_server():
+    """
+    Start a long-lived local LanguageTool server for US English on a free port and
+    add it to the round-robin.
+    """
+    tool = language_tool_python.LanguageTool('en-US', config=LT_CONFIG)
+    # The public `url` property (language_tool_python >= 3.1) is the server's /v2/ base URL
+    lt_servers.append((tool, urllib.parse.urljoin(tool.url, "check")))
 
-def generate_report(metrics, advanced_style, contextual_feedback):
+def start_extra_language_tool_servers():
+    """
+    Start the remaining LT_POOL_SIZE - 1 servers one after another; each joins the
+    round-robin as soon as it is up.
     """
-    Generate a comprehensive report combining all computed metrics, style analysis,
-    and contextual feedback.
+    for _ in range(LT_POOL_SIZE - 1):
+        try:
+            start_language_tool_server()
+        except Exception as e:
+            print("LanguageTool Error, extra server not started:", e)
+            return
+
+# The first server is started before the window opens; it also downloads and unpacks
+# LanguageTool on first run. Any others start in the background so they add no startup time.
+start_language_tool_server()
+threading.Thread(target=start_extra_language_tool_servers, daemon=True).start()
+# Seconds to wait for a server before falling back to language_tool_python's own check
+LT_TIMEOUT = 30
+
+# One shared HTTP session keeps connections to the servers alive between checks
+lt_session = requests.Session()
+lt_session.mount("http://", HTTPAdapter(pool_connections=LT_POOL_SIZE, pool_maxsize=4))
+
+# Lightweight record for a LanguageTool match, with the attribute names of
+# language_tool_python's Match for the fields this application uses.
+LTMatch = collections.namedtuple("LTMatch", ["ruleId", "message", "replacements", "offset", "errorLength", "context"])
+
+def check_text(text):
+    """
+    Check the text with one of the LanguageTool servers over the shared session.
+    
+    If the request fails or times out, the check is repeated through the server's
+    LanguageTool instance, which retries and restarts its local server.
     
     Args:
-        metrics: Dictionary containing basic metrics such as score, word count, etc.
-        advanced_style: Dictionary containing advanced readability and style metrics.
-        contextual_feedback: A string containing additional feedback based on errors.
+        text: The text to check.
     
     Returns:
-        A formatted string report summarizing the analysis.
-    """
-    report = (
-        "Grammar Analysis Report\n"
-        "--------------------------\n"
-        f"Overall Score: {metrics['score']}/100\n"
-        f"Word Count: {metrics['word_count']}\n"
-        f"Speaking Rate: {metrics['wpm']} WPM\n"
-        f"Filler Words: {metrics['filler_count']}\n\n"
-        "Error Breakdown:\n"
-        f"- Grammar: {metrics['errors'].get('GRAMMAR', 0)}\n"
-        f"- Spelling: {metrics['errors'].get('TYPOS', 0)}\n"
-        f"- Punctuation: {metrics['errors'].get('PUNCTUATION', 0)}\n\n"
-        "Advanced Style Metrics:\n"
-        f"- Flesch Reading Ease: {advanced_style['flesch_reading_ease']:.2f}\n"
-        f"- Flesch-Kincaid Grade Level: {advanced_style['flesch_kincaid_grade']:.2f}\n"
-        f"- Gunning Fog Index: {advanced_style['gunning_fog']:.2f}\n"
-        f"Style Comment: {advanced_style['style_comment']}\n"
-        f"Recommendations: {advanced_style['advanced_recommendations']}\n\n"
-        "Contextual Language Feedback:\n"
-        f"{contextual_feedback}\n"
+        A tuple of LTMatch records.
+    """
+    tool, endpoint = lt_servers[next(lt_counter) % len(lt_servers)]
+    try:
+        response = lt_session.post(endpoint, data={'text': text, 'language': 'en-US'}, timeout=LT_TIMEOUT)
+        response.raise_for_status()
+        matches = response.json()['matches']
+    except requests.RequestException as e:
+        print("LanguageTool Error, retrying through language_tool_python:", e)
+        return tuple(
+            LTMatch(
+                ruleId=match.rule_id,
+                message=match.message,
+                replacements=match.replacements,
+                offset=match.offset,
+                errorLength=match.error_length,
+                context=match.context
+            )
+            for match in tool.check(text)
+        )
+    # The server counts offsets in UTF-16 code units, in which characters outside the
+    # BMP (e.g. emoji) take two; map offsets and lengths back to Python string indices
+    wide_chars = four_byte_char_positions(text)
+    
+    def to_index(offset):
+        return offset - bisect.bisect_left(wide_chars, offset)
+    
+    return tuple(
+        LTMatch(
+            ruleId=match['rule']['id'],
+            message=match['message'],
+            replacements=[replacement['value'] for replacement in match['replacements']],
+            offset=to_index(match['offset']),
+            errorLength=to_index(match['offset'] + match['length']) - to_index(match['offset']),
+            context=match['context']['text']
+        )
+        for match in matches
     )
-    return report
 
-# ---------------------------
-# Initialize Models & Tools
-# ---------------------------
+# Cache of LanguageTool results keyed by a digest of the checked text, so the cache
+# does not keep whole transcripts alive. Oldest entries are evicted first.
+LT_CACHE_SIZE = 128
+_check_cache = {}
+_check_cache_lock = threading.Lock()
+
+def _check_cached(text):
+    """
+    Run LanguageTool on the text, reusing the result for identical text so that
+    analysis, inline highlighting and corrections share a single check.
+    
+    Args:
+        text: The text to check.
+    
+    Returns:
+        A tuple of LTMatch records.
+    """
+    key = hashlib.blake2b(text.encode(), digest_size=16).digest()
+    with _check_cache_lock:
+        matches = _check_cache.get(key)
+    if matches is None:
+        matches = check_text(text)
+        with _check_cache_lock:
+            _check_cache[key] = matches
+            if len(_check_cache) > LT_CACHE_SIZE:
+                del _check_cache[next(iter(_check_cache))]
+    return matches
 
-# Load the Whisper model for audio transcription (using the "base" model variant)
-model = whisper.load_model("base")
-# Initialize the language tool for US English
-tool = language_tool_python.LanguageTool('en-US')
+def correct_text(text):
+    """
+    Apply the first suggested replacement of every error to the text.
+    
+    The correction is built locally from the cached matches, so it never needs a
+    second round-trip to the LanguageTool server.
+    
+    Args:
+        text: The text to correct.
+    
+    Returns:
+        The corrected text.
+    """
+    pieces = []
+    end = len(text)
+    # Work backwards so earlier offsets stay valid; skip overlapping matches
+    for match in sorted(_check_cached(text), key=lambda match: match.offset, reverse=True):
+        match_end = match.offset + match.errorLength
+        if not match.replacements or match_end > end:
+            continue
+        pieces.append(text[match_end:end])
+        pieces.append(match.replacements[0])
+        end = match.offset
+    pieces.append(text[:end])
+    return "".join(reversed(pieces))
 
 # ---------------------------
 # Audio Recording Setup
 # ---------------------------
 
-# Set the sample rate for audio recording (in Hertz)
-SAMPLE_RATE = 44100
-# Temporary file name for saving recorded audio
-TEMP_AUDIO_FILE = "temp_recording.wav"
+# Set the sample rate for audio recording (in Hertz). Whisper works on 16 kHz mono
+# audio, so capturing at that rate avoids resampling every window before decoding.
+SAMPLE_RATE = 16000
+# Number of frames delivered to the audio callback per block (100 ms)
+BLOCK_SIZE = 1600
+# Streaming transcription: re-transcribe after this much new audio (in seconds)
+STREAM_STEP_SECONDS = 1.0
+# Streaming transcription: trim committed audio once the window grows past this (in seconds)
+STREAM_WINDOW_SECONDS = 5.0
+# Maximum recording length (in seconds); the buffer is allocated once at this size
+MAX_RECORDING_SECONDS = 600
 # Variables for managing audio recording state
 recording_stream = None
-recorded_frames = []
+recorded_audio = np.empty((SAMPLE_RATE * MAX_RECORDING_SECONDS, 1), dtype=np.float32)
+recorded_length = 0      # Number of valid samples in recorded_audio (the write index)
+recorded_lock = threading.Lock()
 recording_start_time = None
 timer_job = None
+# Variables for managing the background streaming transcription
+# (a fresh stop event and state are created for every recording)
+stream_thread = None
+stream_stop_event = None
+stream_state = None
 
 def audio_callback(indata, frames, time_info, status):
     """
@@ -234,10 +327,185 @@ def audio_callback(indata, frames, time_info, status):
         time_info: Dictionary containing timing information.
         status: Status of the recording.
     """
+    global recorded_length
     if status:
         print("Recording Status:", status)
-    # Append a copy of the current audio chunk to recorded_frames
-    recorded_frames.append(indata.copy())
+    start = recorded_length
+    count = min(len(indata), len(recorded_audio) - start)
+    if start < len(recorded_audio) == start + count:
+        print("Recording Status: maximum recording length reached, further audio is dropped")
+    # indata is only valid during the callback, so copy it straight into the
+    # preallocated buffer with a single memcpy (no per-block allocation)
+    np.copyto(recorded_audio[start:start + count], indata[:count])
+    # Publish the new write index only after the samples are in place
+    with recorded_lock:
+        recorded_length = start + count
+
+def get_recorded_audio():
+    """
+    Return everything recorded so far as a 1-D float32 array (a view, not a copy).
+    """
+    with recorded_lock:
+        length = recorded_length
+    return recorded_audio[:length, 0]
+
+def _normalize_word(word):
+    """
+    Normalize a word so consecutive hypotheses can be compared.
+    """
+    return word.lower().strip(".,!?;:\"'")
+
+def new_stream_state():
+    """
+    Create the streaming transcription state for a new recording.
+    
+    Returns:
+        A dictionary with the confirmed words ("committed", as (start, end, text) with
+        timestamps in seconds), the latest unconfirmed words awaiting agreement
+        ("hypothesis") and the sample index where the uncommitted window starts ("offset").
+    """
+    return {"committed": [], "hypothesis": [], "offset": 0}
+
+def transcribe_stream_window(state, audio, audio_start=0, final=False):
+    """
+    Transcribe the uncommitted part of the recording and commit stable words.
+    
+    Uses the LocalAgreement-2 policy: a word is committed only once two consecutive
+    hypotheses agree on it. On the final call every remaining word is committed.
+    
+    Args:
+        state: The streaming state of the recording (see new_stream_state).
+        audio: Recorded samples (1-D float32, SAMPLE_RATE) starting at sample audio_start.
+        audio_start: Sample index of the recording where audio begins.
+        final: True when recording has stopped and the tail should be flushed.
+    """
+    committed = state["committed"]
+    window = audio[state["offset"] - audio_start:]
+    if len(window) == 0:
+        return
+    window_start = state["offset"] / SAMPLE_RATE
+    committed_end = committed[-1][1] if committed else 0.0
+    # Condition the decoder on the text committed so far
+    prompt = " ".join(word for _, _, word in committed[-50:]) or None
+    # VAD drops pauses before decoding, where Whisper would otherwise hallucinate filler
+    # ("Thank you.") that two consecutive windows could agree on; word timestamps are
+    # still relative to the start of the window
+    segments, _ = model.transcribe(window, beam_size=1, vad_filter=True,
+                                   word_timestamps=True, condition_on_previous_text=True,
+                                   initial_prompt=prompt)
+    # Convert to absolute timestamps and drop words that were already committed
+    words = [(window_start + w.start, window_start + w.end, w.word.strip())
+             for segment in segments for w in segment.words]
+    words = [w for w in words if w[0] >= committed_end - 0.05 and w[2]]
+    
+    if final:
+        committed.extend(words)
+        state["hypothesis"] = []
+        return
+    
+    # Commit the longest common prefix of the previous and current hypotheses
+    agreed = 0
+    for previous, current in zip(state["hypothesis"], words):
+        if _normalize_word(previous[2]) != _normalize_word(current[2]):
+            break
+        agreed += 1
+    committed.extend(words[:agreed])
+    state["hypothesis"] = words[agreed:]
+    
+    # Keep the window short by dropping audio that is already committed
+    if agreed and len(window) > STREAM_WINDOW_SECONDS * SAMPLE_RATE:
+        state["offset"] = int(committed[-1][1] * SAMPLE_RATE)
+    # Hypotheses that keep disagreeing (noise, music) would otherwise grow the window
+    # without limit: commit the current hypothesis and move past it
+    elif len(window) > 2 * STREAM_WINDOW_SECONDS * SAMPLE_RATE:
+        committed.extend(state["hypothesis"])
+        state["hypothesis"] = []
+        if committed and committed[-1][1] > window_start:
+            state["offset"] = int(committed[-1][1] * SAMPLE_RATE)
+        else:
+            # Nothing recognisable in the window; keep only its last STREAM_WINDOW_SECONDS
+            state["offset"] += len(window) - int(STREAM_WINDOW_SECONDS * SAMPLE_RATE)
+
+def streaming_worker(state, stop_event):
+    """
+    Background thread that transcribes the recording while it is still in progress,
+    so only a short tail is left to transcribe when the user stops recording.
+    
+    Args:
+        state: The streaming state of this recording (see new_stream_state).
+        stop_event: Event set by stop_recording when this recording ends.
+    """
+    transcribed_length = 0
+    while not stop_event.wait(STREAM_STEP_SECONDS):
+        audio = get_recorded_audio()
+        # Skip this round if not enough new audio has arrived
+        if len(audio) - transcribed_length < STREAM_STEP_SECONDS * SAMPLE_RATE:
+            continue
+        transcribed_length = len(audio)
+        # Copy the window: the buffer is reused as soon as the next recording starts
+        window_start = state["offset"]
+        window = audio[window_start:].copy()
+        # A stop after the copy means it may belong to the next recording
+        if stop_event.is_set():
+            break
+        try:
+            transcribe_stream_window(state, window, window_start)
+        except Exception as e:
+            # Uncommitted audio is retried on the next round or flushed at stop
+            print("Streaming Transcription Error:", e)
+
+def finish_streaming_transcription(thread, state, tail, tail_start):
+    """
+    Wait for a stopped streaming worker, transcribe the remaining tail of its
+    recording and return the full transcript (committed words + tail).
+    
+    Args:
+        thread: The streaming worker thread of the recording (already told to stop), or None.
+        state: The streaming state of the recording.
+        tail: Copy of the recorded samples from tail_start to the end of the recording.
+        tail_start: Sample index of the recording where tail begins.
+    
+    Returns:
+        The transcribed text, or None if transcription failed before any words were
+        committed.
+    """
+    # The worker may still be finishing one window; it only moves the offset forward
+    if thread is not None:
+        thread.join()
+    try:
+        transcribe_stream_window(state, tail, tail_start, final=True)
+    except Exception as e:
+        # Runs on a worker thread, so the dialog is scheduled on the Tk main loop
+        root.after(0, messagebox.showerror, "Transcription Error", f"Error during transcription: {e}")
+        if not state["committed"]:
+            return None
+    return " ".join(word for _, _, word in state["committed"])
+
+def load_audio_file(file_path):
+    """
+    Load an audio file as 16 kHz mono float32 samples, resampling it once up front
+    so every later stage works on the smaller array. The file is opened only once;
+    the duration is derived from the decoded samples.
+    
+    Args:
+        file_path: Path to the audio file.
+    
+    Returns:
+        A tuple (audio, duration) with a 1-D float32 array at SAMPLE_RATE and the
+        duration in seconds, or (file_path, None) if soundfile cannot decode the
+        format (e.g. m4a), in which case Whisper decodes it via FFmpeg.
+    """
+    try:
+        audio, file_sample_rate = sf.read(file_path, dtype='float32', always_2d=False)
+    except Exception:
+        return file_path, None
+    audio_duration = len(audio) / file_sample_rate
+    # Down-mix multi-channel audio to mono
+    if audio.ndim > 1:
+        audio = audio.mean(axis=1)
+    if file_sample_rate != SAMPLE_RATE:
+        audio = resample_poly(audio, SAMPLE_RATE, file_sample_rate).astype(np.float32)
+    return audio, audio_duration
 
 def transcribe_audio(file_path):
     """
@@ -247,14 +515,22 @@ def transcribe_audio(file_path):
         file_path: Path to the audio file.
     
     Returns:
-        The transcribed text.
+        A tuple (transcript, audio_duration) with the transcribed text and the
+        duration of the audio in seconds, or (None, None) if transcription failed.
     """
     try:
-        result = model.transcribe(file_path)
-        return result['text']
+        audio, audio_duration = load_audio_file(file_path)
+        # Greedy decoding with VAD so silent stretches are skipped entirely;
+        # long audio is split into 30s chunks that are transcribed as batches
+        segments, info = batched_model.transcribe(audio, beam_size=1, chunk_length=30,
+                                                   batch_size=16, vad_filter=True)
+        transcript = " ".join(segment.text.strip() for segment in segments)
+        # Files decoded by Whisper itself report their duration in the transcription info
+        return transcript, audio_duration if audio_duration is not None else info.duration
     except Exception as e:
-        messagebox.showerror("Transcription Error", f"Error during transcription: {e}")
-        return ""
+        # Runs on a worker thread, so the dialog is scheduled on the Tk main loop
+        root.after(0, messagebox.showerror, "Transcription Error", f"Error during transcription: {e}")
+        return None, None
 
 def check_grammar(text):
     """
@@ -270,32 +546,163 @@ def check_grammar(text):
          - error_breakdown: A dictionary with error counts by category.
          - total_errors: The total number of errors detected.
     """
-    matches = tool.check(text)
-    error_details = []
+    matches = _check_cached(text)
     error_breakdown = {"GRAMMAR": 0, "TYPOS": 0, "PUNCTUATION": 0, "STYLE": 0}
     
-    # Process each error match from LanguageTool
-    for match in matches:
-        category = classify_error(match)
+    # Classify each error match from LanguageTool
+    categories = [classify_error(match) for match in matches]
+    for category in categories:
         error_breakdown[category] += 1
-        # Use the first suggested correction if available
-        suggestion = match.replacements[0] if match.replacements else "No suggestion available"
-        explanation = f"This error occurs because: {match.message}. Context: '{match.context}'."
-        error_info = (
-            f"Error: {match.message}\n"
-            f"Category: {category}\n"
-            f"Context: '{match.context}'\n"
-            f"Suggested Correction: {suggestion}\n"
-            f"Explanation: {explanation}\n"
+    # Format the details in one pass, using the first suggested correction if available
+    error_details = [
+        "\n".join((
+            f"Error: {match.message}",
+            f"Category: {category}",
+            f"Context: '{match.context}'",
+            f"Suggested Correction: {match.replacements[0] if match.replacements else 'No suggestion available'}",
+            f"Explanation: This error occurs because: {match.message}. Context: '{match.context}'.",
             "-----"
-        )
-        error_details.append(error_info)
+        ))
+        for match, category in zip(matches, categories)
+    ]
     
     # Calculate weighted penalty based on error counts and predefined weights
     weighted_penalty = sum(ERROR_WEIGHTS[cat] * count for cat, count in error_breakdown.items())
     overall_score = max(100 - weighted_penalty, 0)
     return overall_score, error_details, error_breakdown, len(matches)
 
+async def analyze_transcript(transcript, audio_duration):
+    """
+    Run the full analysis (grammar, style, feedback, metrics and report) on a transcript.
+    
+    Args:
+        transcript: The transcribed text.
+        audio_duration: Duration of the audio (in seconds).
+    
+    Returns:
+        A dictionary with the score, error count, error details, style analysis and report.
+    """
+    loop = asyncio.get_running_loop()
+    # The grammar check (mostly waiting on the LanguageTool server) and the readability
+    # indices (pure Python) only share the immutable transcript, so run them concurrently
+    grammar_result, advanced_style = await asyncio.gather(
+        loop.run_in_executor(executor, check_grammar, transcript),
+        loop.run_in_executor(executor, advanced_style_analysis, transcript)
+    )
+    overall_score, error_details, error_breakdown, total_errors = grammar_result
+    contextual_feedback = contextual_language_feedback(transcript, error_breakdown)
+    metrics = compute_metrics(transcript, audio_duration, error_breakdown, overall_score)
+    report = generate_report(metrics, advanced_style, contextual_feedback)
+    return {
+        "score": overall_score,
+        "total_errors": total_errors,
+        "error_details": error_details,
+        "advanced_style": advanced_style,
+        "report": report
+    }
+
+def start_analysis_job():
+    """
+    Start a new transcription and analysis: show it as in progress and return its id.
+    Results of any earlier job still running are discarded when they arrive.
+    """
+    global analysis_job
+    analysis_job += 1
+    score_label.config(text="Grammar Score: Analyzing...")
+    return analysis_job
+
+def reset_score_label(job):
+    """
+    Clear the "Analyzing..." score label after a failed transcription or analysis,
+    unless a newer job has started since.
+    """
+    if job == analysis_job:
+        score_label.config(text="Grammar Score: N/A")
+
+def analyze_in_background(job, transcript, audio_duration):
+    """
+    Analyze a transcript on the background event loop and hand the results to the Tk main loop.
+    
+    Args:
+        job: Id of the job (see start_analysis_job).
+        transcript: The transcribed text, or None if transcription failed (already reported).
+        audio_duration: Duration of the audio (in seconds).
+    """
+    if transcript is None:
+        root.after(0, reset_score_label, job)
+        return
+    future = asyncio.run_coroutine_threadsafe(analyze_transcript(transcript, audio_duration), analysis_loop)
+    future.add_done_callback(lambda future: _on_analysis_done(job, transcript, future))
+
+def _on_analysis_done(job, transcript, future):
+    """
+    Schedule the analysis results (or the error) for display on the Tk main loop.
+    """
+    try:
+        results = future.result()
+    except Exception as e:
+        root.after(0, messagebox.showerror, "Analysis Error", f"Error during analysis: {e}")
+        root.after(0, reset_score_label, job)
+        return
+    root.after(0, show_results, job, transcript, results)
+
+def update_text_widget(widget, new_text):
+    """
+    Replace the contents of a text widget, deleting and inserting only the span
+    that differs from the current contents. Unchanged text before and after it is
+    not re-laid out and keeps its tags.
+    
+    Args:
+        widget: The Tkinter text widget to update.
+        new_text: The text the widget should contain.
+    """
+    old_text = widget.get("1.0", "end-1c")
+    if old_text == new_text:
+        return
+    start, old_end, new_end = changed_span(old_text, new_text)
+    start_index = f"1.0+{start}c"
+    # Replace the changed middle with a single delete and insert
+    if old_end > start:
+        widget.delete(start_index, f"1.0+{old_end}c")
+    if new_end > start:
+        widget.insert(start_index, new_text[start:new_end])
+
+def show_results(job, transcript, results):
+    """
+    Update the GUI text widgets with the transcript and its analysis results.
+    
+    Args:
+        job: Id of the job the results belong to (see start_analysis_job).
+        transcript: The transcribed text.
+        results: The dictionary returned by analyze_transcript.
+    """
+    # A newer file or recording was submitted while this one was being analyzed
+    if job != analysis_job:
+        return
+    error_details = results["error_details"]
+    advanced_style = results["advanced_style"]
+    # Update the transcript text widget with the transcription result
+    update_text_widget(transcript_text, transcript)
+    # Update the score label with overall grammar score and error count
+    score_label.config(text=f"Grammar Score: {results['score']} (Total Errors: {results['total_errors']})")
+    # Update the errors text widget with detailed error information
+    if error_details:
+        update_text_widget(errors_text, "\n\n".join(error_details))
+    else:
+        update_text_widget(errors_text, "No grammatical errors found.")
+    # Update the style analysis text widget with advanced readability metrics
+    update_text_widget(style_text,
+        f"Flesch Reading Ease Score: {advanced_style['flesch_reading_ease']:.2f}\n"
+        f"Flesch-Kincaid Grade Level: {advanced_style['flesch_kincaid_grade']:.2f}\n"
+        f"Gunning Fog Index: {advanced_style['gunning_fog']:.2f}\n"
+        f"Style Comment: {advanced_style['style_comment']}\n"
+        f"Recommendations: {advanced_style['advanced_recommendations']}"
+    )
+    # Update the comprehensive report text widget
+    update_text_widget(report_text, results["report"])
+    # Clear any previous inline error highlights
+    clear_inline_errors()
+
 def process_file():
     """
     Process an audio file selected from disk:
@@ -307,45 +714,11 @@ def process_file():
     file_path = filedialog.askopenfilename(title="Select Audio File",
                                            filetypes=[("Audio Files", "*.wav *.mp3 *.m4a")])
     if file_path:
-        # Transcribe the audio file
-        transcript = transcribe_audio(file_path)
-        try:
-            info = sf.info(file_path)
-            audio_duration = info.duration
-        except Exception:
-            audio_duration = 0
-        # Check grammar and style on the transcript
-        overall_score, error_details, error_breakdown, total_errors = check_grammar(transcript)
-        advanced_style = advanced_style_analysis(transcript)
-        contextual_feedback = contextual_language_feedback(transcript, error_details)
-        metrics = compute_metrics(transcript, audio_duration, error_breakdown, overall_score)
-        report = generate_report(metrics, advanced_style, contextual_feedback)
-        
-        # Update the transcript text widget with the transcription result
-        transcript_text.delete(1.0, tk.END)
-        transcript_text.insert(tk.END, transcript)
-        # Update the score label with overall grammar score and error count
-        score_label.config(text=f"Grammar Score: {overall_score} (Total Errors: {total_errors})")
-        # Update the errors text widget with detailed error information
-        errors_text.delete(1.0, tk.END)
-        if error_details:
-            errors_text.insert(tk.END, "\n\n".join(error_details))
-        else:
-            errors_text.insert(tk.END, "No grammatical errors found.")
-        # Update the style analysis text widget with advanced readability metrics
-        style_text.delete(1.0, tk.END)
-        style_text.insert(tk.END, 
-            f"Flesch Reading Ease Score: {advanced_style['flesch_reading_ease']:.2f}\n"
-            f"Flesch-Kincaid Grade Level: {advanced_style['flesch_kincaid_grade']:.2f}\n"
-            f"Gunning Fog Index: {advanced_style['gunning_fog']:.2f}\n"
-            f"Style Comment: {advanced_style['style_comment']}\n"
-            f"Recommendations: {advanced_style['advanced_recommendations']}"
-        )
-        # Update the comprehensive report text widget
-        report_text.delete(1.0, tk.END)
-        report_text.insert(tk.END, report)
-        # Clear any previous inline error highlights
-        clear_inline_errors()
+        job = start_analysis_job()
+        # Load and transcribe the audio file off the Tk main thread
+        future_transcript = executor.submit(transcribe_audio, file_path)
+        # Check grammar and style on the transcript once it is ready and show the results
+        future_transcript.add_done_callback(lambda future: analyze_in_background(job, *future.result()))
 
 def update_timer():
     """
@@ -354,21 +727,36 @@ def update_timer():
     global timer_job
     if recording_start_time is not None:
         elapsed = int(time.time() - recording_start_time)
-        timer_label.config(text=f"Recording Time: {elapsed} sec")
+        if recorded_length >= len(recorded_audio):
+            timer_label.config(text=f"Recording Time: {elapsed} sec "
+                                    f"(limit of {MAX_RECORDING_SECONDS} sec reached, further audio is dropped)")
+        else:
+            timer_label.config(text=f"Recording Time: {elapsed} sec")
         timer_job = root.after(1000, update_timer)
 
 def start_recording():
     """
     Start audio recording using sounddevice and update the timer.
     """
-    global recording_stream, recorded_frames, recording_start_time, timer_job
-    recorded_frames = []  # Reset the recorded frames
+    global recording_stream, recorded_length, recording_start_time, timer_job
+    global stream_thread, stream_stop_event, stream_state
+    with recorded_lock:
+        recorded_length = 0  # Reset the recorded audio (the buffer is reused)
+    # Fresh streaming transcription state, so a previous recording still being
+    # flushed in the background is never affected
+    stream_state = new_stream_state()
+    stream_stop_event = threading.Event()
     recording_start_time = time.time()  # Record the start time
     update_timer()  # Begin updating the timer
     try:
         # Start a new input stream for recording audio
-        recording_stream = sd.InputStream(samplerate=SAMPLE_RATE, channels=1, callback=audio_callback)
+        recording_stream = sd.InputStream(samplerate=SAMPLE_RATE, channels=1, dtype='float32',
+                                          blocksize=BLOCK_SIZE, callback=audio_callback)
         recording_stream.start()
+        # Transcribe in the background while the user is still speaking
+        stream_thread = threading.Thread(target=streaming_worker, args=(stream_state, stream_stop_event),
+                                         daemon=True)
+        stream_thread.start()
     except Exception as e:
         messagebox.showerror("Recording Error", f"Error starting recording: {e}")
 
@@ -376,59 +764,39 @@ def stop_recording():
     """
     Stop audio recording, process the recorded audio, and generate the analysis report.
     """
-    global recording_stream, recorded_frames, recording_start_time, timer_job
+    global recording_stream, recording_start_time, timer_job, stream_thread
     try:
         if recording_stream is not None:
             # Stop and close the recording stream
             recording_stream.stop()
             recording_stream.close()
             recording_stream = None
+            # Stop the background worker now and take this recording's state and
+            # untranscribed tail, before a new recording can reuse them
+            stream_stop_event.set()
+            thread, state = stream_thread, stream_state
+            stream_thread = None
+            tail_start = state["offset"]
+            tail = get_recorded_audio()[tail_start:].copy()
             if timer_job:
                 root.after_cancel(timer_job)
                 timer_job = None
-            # Calculate the duration of the recorded audio
-            audio_duration = time.time() - recording_start_time
-            if recorded_frames:
-                # Concatenate recorded frames and save to a temporary audio file
-                audio_data = np.concatenate(recorded_frames, axis=0)
-                sf.write(TEMP_AUDIO_FILE, audio_data, SAMPLE_RATE)
-                timer_label.config(text="Recording Stopped")
-                
-                # Transcribe the recorded audio
-                transcript = transcribe_audio(TEMP_AUDIO_FILE)
-                overall_score, error_details, error_breakdown, total_errors = check_grammar(transcript)
-                advanced_style = advanced_style_analysis(transcript)
-                contextual_feedback = contextual_language_feedback(transcript, error_details)
-                metrics = compute_metrics(transcript, audio_duration, error_breakdown, overall_score)
-                report = generate_report(metrics, advanced_style, contextual_feedback)
-                
-                # Update GUI with the results
-                transcript_text.delete(1.0, tk.END)
-                transcript_text.insert(tk.END, transcript)
-                score_label.config(text=f"Grammar Score: {overall_score} (Total Errors: {total_errors})")
-                errors_text.delete(1.0, tk.END)
-                if error_details:
-                    errors_text.insert(tk.END, "\n\n".join(error_details))
+            # Calculate the duration of the recorded audio from the samples kept, since
+            # audio past MAX_RECORDING_SECONDS is dropped
+            audio_duration = recorded_length / SAMPLE_RATE
+            if recorded_length:
+                if recorded_length >= len(recorded_audio):
+                    timer_label.config(text=f"Recording Stopped (truncated to {MAX_RECORDING_SECONDS} sec)")
                 else:
-                    errors_text.insert(tk.END, "No grammatical errors found.")
-                style_text.delete(1.0, tk.END)
-                style_text.insert(tk.END, 
-                    f"Flesch Reading Ease Score: {advanced_style['flesch_reading_ease']:.2f}\n"
-                    f"Flesch-Kincaid Grade Level: {advanced_style['flesch_kincaid_grade']:.2f}\n"
-                    f"Gunning Fog Index: {advanced_style['gunning_fog']:.2f}\n"
-                    f"Style Comment: {advanced_style['style_comment']}\n"
-                    f"Recommendations: {advanced_style['advanced_recommendations']}"
-                )
-                report_text.delete(1.0, tk.END)
-                report_text.insert(tk.END, report)
-                # Clear any inline error highlights from previous analysis
-                clear_inline_errors()
+                    timer_label.config(text="Recording Stopped")
+                job = start_analysis_job()
                 
-                # Clean up temporary audio file
-                try:
-                    os.remove(TEMP_AUDIO_FILE)
-                except Exception:
-                    pass
+                # Most of the audio was transcribed while recording; flush the tail
+                # and analyze it off the Tk main thread
+                future_transcript = executor.submit(finish_streaming_transcription, thread, state,
+                                                    tail, tail_start)
+                future_transcript.add_done_callback(
+                    lambda future: analyze_in_background(job, future.result(), audio_duration))
             else:
                 timer_label.config(text="No audio data recorded.")
         else:
@@ -501,6 +869,85 @@ def error_click_callback(event, tag):
     tk.Button(popup, text="Apply Correction", command=apply_correction).pack(pady=10)
     tk.Button(popup, text="Cancel", command=popup.destroy).pack()
 
+def _common_prefix_length(a, b):
+    """
+    Return the length of the common prefix of two strings. Binary search over slice
+    comparisons keeps the character work in C.
+    """
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def changed_span(old_text, new_text):
+    """
+    Find the single span that differs between two versions of a text, by trimming
+    their common prefix and suffix.
+    
+    Args:
+        old_text: The previous text.
+        new_text: The current text.
+    
+    Returns:
+        A tuple (start, old_end, new_end): the changed span is old_text[start:old_end]
+        in the previous text and new_text[start:new_end] in the current one.
+    """
+    start = _common_prefix_length(old_text, new_text)
+    # Compare the remainders reversed so the suffix never overlaps the prefix
+    suffix = _common_prefix_length(old_text[start:][::-1], new_text[start:][::-1])
+    return start, len(old_text) - suffix, len(new_text) - suffix
+
+def _shift_match(match, delta):
+    """
+    Return a copy of a match with its offset moved by delta characters.
+    """
+    return match._replace(offset=match.offset + delta)
+
+def check_inline_text(text):
+    """
+    Return LanguageTool matches for the transcript, re-checking only the paragraphs
+    that changed since the last inline check. Matches before the edit are kept, and
+    matches after it are shifted by the change in length.
+    
+    Args:
+        text: The current transcript text.
+    
+    Returns:
+        A tuple of match objects with offsets into text.
+    """
+    global last_inline_text, last_inline_matches
+    if text == last_inline_text:
+        return last_inline_matches
+    old_text = last_inline_text
+    change_start, _, change_end = changed_span(old_text, text)
+    unchanged = change_start + len(text) - change_end
+    # A new recording or file replaces the transcript wholesale: check it all at once
+    if not old_text or change_start == 0 or unchanged < len(text) // 2:
+        matches = _check_cached(text)
+    else:
+        # Span of the edit in the new text, widened to whole paragraphs
+        paragraph_start = text.rfind("\n\n", 0, change_start)
+        paragraph_start = 0 if paragraph_start == -1 else paragraph_start + 2
+        paragraph_end = text.find("\n\n", change_end)
+        paragraph_end = len(text) if paragraph_end == -1 else paragraph_end
+        # Text before and after the edit is unchanged, so map the paragraph bounds back
+        delta = len(text) - len(old_text)
+        old_paragraph_end = paragraph_end - delta
+        
+        before = [match for match in last_inline_matches
+                  if match.offset + match.errorLength <= paragraph_start]
+        after = [_shift_match(match, delta) for match in last_inline_matches
+                 if match.offset >= old_paragraph_end]
+        rechecked = [_shift_match(match, paragraph_start)
+                     for match in _check_cached(text[paragraph_start:paragraph_end])]
+        matches = tuple(before + rechecked + after)
+    last_inline_text, last_inline_matches = text, matches
+    return matches
+
 def inline_error_correction():
     """
     Highlight errors directly in the transcript text widget.
@@ -508,7 +955,7 @@ def inline_error_correction():
     """
     clear_inline_errors()  # Clear any existing highlights
     transcript = transcript_text.get("1.0", "end-1c")
-    matches = tool.check(transcript)
+    matches = check_inline_text(transcript)
     for i, match in enumerate(matches):
         # Calculate the text indices where the error occurs using offset and error length
         start_index = f"1.0+{match.offset}c"
@@ -527,7 +974,7 @@ def show_comparison_mode():
     and the corrected version. This helps the user see improvements.
     """
     original = transcript_text.get("1.0", "end-1c")
-    corrected = tool.correct(original)
+    corrected = correct_text(original)
     
     # Create a new top-level window for comparison
     comp_window = tk.Toplevel(root)
@@ -561,9 +1008,8 @@ def correct_transcript():
         messagebox.showinfo("Correction", "No transcript available to correct.")
         return
     try:
-        corrected = tool.correct(transcript)
-        transcript_text.delete("1.0", tk.END)
-        transcript_text.insert(tk.END, corrected)
+        corrected = correct_text(transcript)
+        update_text_widget(transcript_text, corrected)
         messagebox.showinfo("Correction", "Transcript has been corrected.")
         clear_inline_errors()
     except Exception as e:
@@ -0,0 +1,14 @@
+# Cython declarations for metrics.py (augmenting .pxd).
+# Only read by ``cythonize -i -3 metrics.py``; metrics.py runs unchanged without Cython.
+# count_filler_words and the contextual feedback helpers stay plain Python
+# (closure, generator expression and lru_cache are not allowed in cpdef functions).
+
+import cython
+
+cpdef str classify_error(object match)
+
+@cython.locals(words=list, word_count=Py_ssize_t, wpm=double, filler_count=Py_ssize_t)
+cpdef dict compute_metrics(str transcript, double audio_duration, dict error_breakdown, object overall_score)
+
+@cython.locals(report=str)
+cpdef str generate_report(dict metrics, dict advanced_style, str contextual_feedback)
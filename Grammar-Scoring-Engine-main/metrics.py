@@ -0,0 +1,214 @@
+"""
+Transcript metrics for the Grammar Scoring Engine: error classification, filler-word
+counting, speaking-rate metrics, contextual feedback and the text report.
+
+This module has no GUI or model dependencies, so it can be compiled ahead of time
+with Cython for long-document workloads (``cythonize -i -3 metrics.py``), using the
+C types declared in ``metrics.pxd``. The compiled extension is picked up automatically
+by ``from metrics import ...``.
+"""
+
+import functools                   # For caching contextual feedback
+import re                          # For matching filler words
+try:
+    import hyperscan               # Optional: multi-pattern DFA for counting filler words
+except ImportError:
+    hyperscan = None
+
+# ---------------------------
+# Global Constants
+# ---------------------------
+
+# List of filler words to count in the transcript.
+FILLER_WORDS = ["um", "uh", "like", "you know", "ah", "er"]
+# Single pattern matching any whole filler word, so the transcript is scanned once
+FILLER_RE = re.compile(r"\b(?:" + "|".join(re.escape(filler) for filler in FILLER_WORDS) + r")\b")
+
+def _build_filler_database():
+    """
+    Compile all filler words into one Hyperscan database, or return None if
+    Hyperscan is not installed (FILLER_RE is used instead).
+    """
+    if hyperscan is None:
+        return None
+    database = hyperscan.Database()
+    database.compile(
+        expressions=[rb"\b" + filler.encode() + rb"\b" for filler in FILLER_WORDS],
+        ids=list(range(len(FILLER_WORDS))),
+        flags=[hyperscan.HS_FLAG_CASELESS] * len(FILLER_WORDS)
+    )
+    return database
+
+FILLER_DATABASE = _build_filler_database()
+
+# Suggestions given for each error category that occurs in the transcript.
+CATEGORY_FEEDBACK = {
+    "TYPOS": "Review suggested corrections for typos and consider using a spell-checker.",
+    "GRAMMAR": "Review grammar suggestions and study common grammatical patterns.",
+    "PUNCTUATION": "Review punctuation guidelines to improve sentence clarity.",
+    "STYLE": "Consider revising stylistically ambiguous sentences for better readability."
+}
+
+# Categories decided by the LanguageTool rule id alone.
+RULE_CATEGORIES = {
+    "MORFOLOGIK_RULE_EN_US": "TYPOS"
+}
+
+# ---------------------------
+# Metrics & Report
+# ---------------------------
+
+def classify_error(match):
+    """
+    Classify a grammar/style error (match) into one of the categories:
+    'GRAMMAR', 'TYPOS', 'PUNCTUATION', or 'STYLE'
+    
+    Args:
+        match: A LanguageTool match record (ruleId, message, ...) containing error details.
+    
+    Returns:
+        A string representing the error category.
+    """
+    # Classify by rule id first (spell checker)
+    category = RULE_CATEGORIES.get(match.ruleId)
+    if category:
+        return category
+    message = match.message.lower()
+    # Classify as typo if message mentions spelling
+    if "spelling" in message:
+        return "TYPOS"
+    # Classify as punctuation if message contains punctuation keywords
+    elif "punctuation" in message:
+        return "PUNCTUATION"
+    # Classify as style if message indicates style or readability issues
+    elif "style" in message or "readability" in message:
+        return "STYLE"
+    # Default category is grammar
+    else:
+        return "GRAMMAR"
+
+def count_filler_words(transcript):
+    """
+    Count whole-word occurrences of all filler words in a single pass over the transcript.
+    
+    Args:
+        transcript: The transcribed text.
+    
+    Returns:
+        The total number of filler words.
+    """
+    if FILLER_DATABASE is None:
+        return len(FILLER_RE.findall(transcript.lower()))
+    counts = [0] * len(FILLER_WORDS)
+    
+    def on_match(filler_id, start, end, flags, context):
+        counts[filler_id] += 1
+    
+    FILLER_DATABASE.scan(transcript.encode(), match_event_handler=on_match)
+    return sum(counts)
+
+def compute_metrics(transcript, audio_duration, error_breakdown, overall_score):
+    """
+    Compute various metrics from the transcript including:
+      - Word count
+      - Speaking rate (words per minute)
+      - Filler word count
+      - Error counts
+    
+    Args:
+        transcript: The transcribed text from the audio.
+        audio_duration: Duration of the audio recording (in seconds).
+        error_breakdown: Dictionary containing counts of errors by category.
+        overall_score: Final overall grammar score after penalties.
+    
+    Returns:
+        A dictionary of computed metrics.
+    """
+    # Split transcript into words and count them
+    words = transcript.split()
+    word_count = len(words)
+    # Calculate words per minute (WPM)
+    wpm = round(word_count / (audio_duration / 60), 2) if audio_duration > 0 else 0.0
+    # Count whole-word occurrences of all filler words in one pass
+    filler_count = count_filler_words(transcript)
+    
+    metrics = {
+        "score": overall_score,
+        "word_count": word_count,
+        "wpm": wpm,
+        "filler_count": filler_count,
+        "errors": {
+            "GRAMMAR": error_breakdown.get("GRAMMAR", 0),
+            "TYPOS": error_breakdown.get("TYPOS", 0),
+            "PUNCTUATION": error_breakdown.get("PUNCTUATION", 0)
+        }
+    }
+    return metrics
+
+def contextual_language_feedback(text, error_breakdown):
+    """
+    Provide personalized feedback based on the types of errors detected.
+    
+    Args:
+        text: The original transcript text.
+        error_breakdown: Dictionary containing counts of errors by category.
+    
+    Returns:
+        A string containing aggregated contextual feedback.
+    """
+    # The feedback only depends on which categories occurred, so cache on that
+    return _category_feedback(tuple(category for category in CATEGORY_FEEDBACK
+                                    if error_breakdown.get(category, 0)))
+
+@functools.lru_cache(maxsize=64)
+def _category_feedback(categories):
+    """
+    Join the suggestions for the given error categories.
+    
+    Args:
+        categories: A tuple of the error categories that occurred.
+    
+    Returns:
+        A string containing aggregated contextual feedback.
+    """
+    # Append a suggestion for every error category that occurred
+    suggestions = [CATEGORY_FEEDBACK[category] for category in categories]
+    if suggestions:
+        return " ".join(suggestions)
+    else:
+        return "No additional contextual feedback available."
+
+def generate_report(metrics, advanced_style, contextual_feedback):
+    """
+    Generate a comprehensive report combining all computed metrics, style analysis,
+    and contextual feedback.
+    
+    Args:
+        metrics: Dictionary containing basic metrics such as score, word count, etc.
+        advanced_style: Dictionary containing advanced readability and style metrics.
+        contextual_feedback: A string containing additional feedback based on errors.
+    
+    Returns:
+        A formatted string report summarizing the analysis.
+    """
+    report = (
+        "Grammar Analysis Report\n"
+        "--------------------------\n"
+        f"Overall Score: {metrics['score']}/100\n"
+        f"Word Count: {metrics['word_count']}\n"
+        f"Speaking Rate: {metrics['wpm']} WPM\n"
+        f"Filler Words: {metrics['filler_count']}\n\n"
+        "Error Breakdown:\n"
+        f"- Grammar: {metrics['errors'].get('GRAMMAR', 0)}\n"
+        f"- Spelling: {metrics['errors'].get('TYPOS', 0)}\n"
+        f"- Punctuation: {metrics['errors'].get('PUNCTUATION', 0)}\n\n"
+        "Advanced Style Metrics:\n"
+        f"- Flesch Reading Ease: {advanced_style['flesch_reading_ease']:.2f}\n"
+        f"- Flesch-Kincaid Grade Level: {advanced_style['flesch_kincaid_grade']:.2f}\n"
+        f"- Gunning Fog Index: {advanced_style['gunning_fog']:.2f}\n"
+        f"Style Comment: {advanced_style['style_comment']}\n"
+        f"Recommendations: {advanced_style['advanced_recommendations']}\n\n"
+        "Contextual Language Feedback:\n"
+        f"{contextual_feedback}\n"
+    )
+    return report